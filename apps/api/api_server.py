@@ -5,27 +5,45 @@ Provides HTTP API endpoints for the web UI to generate conversations.
 """
 
 import os
-import tempfile
+import threading
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Literal, Optional, Set, Tuple
+from uuid import uuid4
 from datetime import datetime
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 import asyncio
-import json
+import orjson
+import soundfile as sf
 
 from apps.api.dialogue_generator import DialogueParser
-from apps.api.voice_pipeline import create_dialogue_audio
+from apps.api.voice_pipeline import OUTPUT_DIR, VoicePipeline, create_dialogue_audio
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Prepare shared resources before serving.
+
+    Loads and warms up the TTS pipeline for TTS_DEVICE so the first
+    generation doesn't pay for model loading.
+    """
+    pipeline = await asyncio.to_thread(_get_pipeline, TTS_DEVICE)
+    await asyncio.to_thread(pipeline.warm_up)
+    yield
 
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Chatterbox Dialogue Generator API",
     description="Generate multi-speaker AI conversations with voice cloning",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Configure CORS to allow frontend access
@@ -84,15 +102,34 @@ class GenerateDialogueRequest(BaseModel):
         default=True,
         description="Enable audio processing (de-essing, normalization, fades)"
     )
-    device: str = Field(
+    device: Literal["cpu", "cuda"] = Field(
         default="cpu",
         description="Device to use for generation (cpu or cuda)"
     )
+    precision: Literal["fp32", "fp16", "bf16"] = Field(
+        default="fp32",
+        description="Inference precision of the T3 token generator on CUDA (ignored on CPU)"
+    )
+    use_cache: bool = Field(
+        default=True,
+        description="Reuse cached audio for lines already generated with the same voice, text and settings"
+    )
+    skip_processing_if_clean: bool = Field(
+        default=False,
+        description="Skip the high-pass and de-essing filters for lines whose level is already within the target band"
+    )
+
+
+class GenerateDialogueJobResponse(BaseModel):
+    """Response model for a submitted generation job."""
+    status: str
+    job_id: str
 
 
 class GenerateDialogueResponse(BaseModel):
     """Response model for successful generation."""
     status: str
+    job_id: str
     output_file: str
     lines_dir: Optional[str]
     duration_seconds: float
@@ -107,13 +144,101 @@ class ErrorResponse(BaseModel):
     details: Optional[str] = None
 
 
-# Global progress tracking
-progress_data = {
-    "current_line": 0,
-    "total_lines": 0,
-    "status": "idle",  # idle, generating_line, merging, completed, error
-    "message": ""
-}
+# Maximum number of dialogues generated at the same time. Jobs share the
+# TTS device, so running several at once makes every one of them slower.
+MAX_CONCURRENT_GENERATIONS = int(os.getenv("MAX_CONCURRENT_GEN", "1"))
+generation_semaphore = asyncio.Semaphore(MAX_CONCURRENT_GENERATIONS)
+
+# Progress of each generation job, keyed by job ID. Each entry holds
+# current_line, total_lines, status and message, where status is one of:
+# queued, generating_line, merging, completed, error
+progress_jobs: Dict[str, dict] = {}
+
+# Number of progress updates applied to each job, so streams can tell
+# whether anything changed without copying and comparing the progress dict
+progress_versions: Dict[str, int] = {}
+
+# Final outcome of each finished job, keyed by job ID: either
+# {"response": GenerateDialogueResponse} or {"status_code": int, "detail": dict}
+job_results: Dict[str, dict] = {}
+
+# Running generation jobs (kept referenced so they aren't garbage collected)
+_job_tasks: Set[asyncio.Task] = set()
+
+# Seconds a finished job's progress and result stay available
+JOB_RETENTION_SECONDS = 300
+
+# Resolved outputs directory; downloads must resolve to a file inside it
+OUTPUT_ROOT = OUTPUT_DIR.resolve()
+
+# Device whose TTS pipeline is loaded and warmed up at startup
+TTS_DEVICE = os.getenv("TTS_DEVICE", "cpu")
+
+# TTS pipelines shared between requests, keyed by device
+_pipelines: Dict[str, VoicePipeline] = {}
+_pipelines_lock = threading.Lock()
+
+# Set (and replaced) on every progress update. Streams grab the current
+# event before reading progress_jobs, so no update can slip in between.
+progress_changed = asyncio.Event()
+
+# Seconds between SSE keepalive comments while no progress is reported
+SSE_KEEPALIVE_SECONDS = 15
+
+# Pre-encoded SSE comment frame used as keepalive
+SSE_KEEPALIVE_FRAME = b": keepalive\n\n"
+
+
+def _build_sse_frame(payload: bytes) -> bytes:
+    """
+    Build a Server-Sent Events data frame.
+
+    Frames are built as bytes so Starlette can send them without encoding.
+
+    Args:
+        payload: UTF-8 encoded event data (must not contain newlines)
+
+    Returns:
+        Complete SSE frame
+    """
+    return b"data: " + payload + b"\n\n"
+
+
+def update_progress(job_id: str, data: dict):
+    """
+    Update a job's progress and wake up progress streams.
+
+    Args:
+        job_id: Job whose progress changed
+        data: Progress fields to update
+    """
+    global progress_changed
+    job = progress_jobs.get(job_id)
+    if job is None:
+        return
+    job.update(data)
+    progress_versions[job_id] += 1
+    changed, progress_changed = progress_changed, asyncio.Event()
+    changed.set()
+
+
+def _get_pipeline(device: str) -> VoicePipeline:
+    """
+    Return the shared TTS pipeline for a device, loading it on first use.
+
+    Args:
+        device: Device to run the model on ("cpu" or "cuda")
+
+    Returns:
+        Loaded VoicePipeline
+    """
+    with _pipelines_lock:
+        pipeline = _pipelines.get(device)
+        if pipeline is None:
+            pipeline = VoicePipeline(device=device)
+            _pipelines[device] = pipeline
+        return pipeline
+
 
 # API Endpoints
 
@@ -132,28 +257,65 @@ async def health_check():
     }
 
 
-@app.get("/api/progress-stream")
-async def progress_stream():
+@app.get(
+    "/api/progress-stream",
+    responses={
+        404: {"model": ErrorResponse, "description": "Unknown job"}
+    }
+)
+async def progress_stream(job_id: str):
     """
     Server-Sent Events endpoint for real-time progress updates.
 
+    The stream ends once the job completes or fails.
+
+    Args:
+        job_id: ID returned by /api/generate-dialogue
+
     Returns:
         StreamingResponse: SSE stream of progress updates
+
+    Raises:
+        HTTPException: If the job is unknown (or has expired)
     """
+    if job_id not in progress_jobs:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "status": "error",
+                "error": "Job not found",
+                "details": f"No job with ID '{job_id}' (it may have expired)"
+            }
+        )
+
     async def event_generator():
-        last_sent = {}
+        last_version = -1
         while True:
-            # Only send if data has changed
-            current_data = progress_data.copy()
-            if current_data != last_sent:
-                yield f"data: {json.dumps(current_data)}\n\n"
-                last_sent = current_data.copy()
+            changed = progress_changed
+
+            job = progress_jobs.get(job_id)
+            if job is None:
+                break
+
+            # Only send if the job has been updated since the last frame
+            version = progress_versions[job_id]
+            if version != last_version:
+                yield _build_sse_frame(orjson.dumps(job))
+                last_version = version
 
             # Exit if completed or error
-            if current_data.get("status") in ["completed", "error", "idle"]:
+            if job.get("status") in ["completed", "error"]:
                 break
 
-            await asyncio.sleep(0.1)  # Check every 100ms
+            # Sleep until the next update; send a keepalive comment if none
+            # arrives in time so proxies don't drop the idle connection
+            waiter = asyncio.ensure_future(changed.wait())
+            try:
+                done, _ = await asyncio.wait({waiter}, timeout=SSE_KEEPALIVE_SECONDS)
+            finally:
+                waiter.cancel()
+            if not done:
+                yield SSE_KEEPALIVE_FRAME
 
     return StreamingResponse(
         event_generator(),
@@ -165,143 +327,230 @@ async def progress_stream():
     )
 
 
-@app.post(
-    "/api/generate-dialogue",
-    response_model=GenerateDialogueResponse,
-    responses={
-        400: {"model": ErrorResponse, "description": "Bad request"},
-        500: {"model": ErrorResponse, "description": "Server error"}
-    }
-)
-async def generate_dialogue(request: GenerateDialogueRequest):
+def _run_generation(request: GenerateDialogueRequest,
+                    progress_callback: Callable[[dict], None]) -> Tuple[Path, int, float]:
     """
-    Generate a multi-speaker dialogue audio file from text.
+    Parse the dialogue and generate its audio (blocking).
+
+    Runs in a worker thread so the event loop stays responsive.
 
     Args:
         request: Generation parameters including dialogue text and settings
+        progress_callback: Called with progress updates during generation
 
     Returns:
-        GenerateDialogueResponse with output file path and metadata
+        Tuple of (output file path, number of lines, duration in seconds)
 
     Raises:
-        HTTPException: If generation fails
+        HTTPException: If no dialogue lines are found
     """
-    # Reset progress data
-    progress_data["current_line"] = 0
-    progress_data["total_lines"] = 0
-    progress_data["status"] = "idle"
-    progress_data["message"] = ""
+    # Parse the dialogue
+    parser = DialogueParser()
+    dialogue = parser.parse_dialogue_string(request.dialogue_text)
 
-    # Define progress callback
-    def update_progress(data: dict):
-        progress_data.update(data)
+    if not dialogue:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "status": "error",
+                "error": "No dialogue lines found",
+                "details": "Please check the dialogue format"
+            }
+        )
 
-    try:
-        # Create a temporary file to store the dialogue text
-        with tempfile.NamedTemporaryFile(
-            mode='w',
-            suffix='.txt',
-            delete=False,
-            encoding='utf-8'
-        ) as tmp_file:
-            tmp_file.write(request.dialogue_text)
-            tmp_file_path = tmp_file.name
-
-        try:
-            # Parse the dialogue
-            parser = DialogueParser()
-            dialogue = parser.parse_dialogue_file(tmp_file_path)
-
-            if not dialogue:
-                raise HTTPException(
-                    status_code=400,
-                    detail={
-                        "status": "error",
-                        "error": "No dialogue lines found",
-                        "details": "Please check the dialogue format"
-                    }
-                )
-
-            # Generate the audio with progress tracking
-            output_path = create_dialogue_audio(
-                dialogue=dialogue,
-                output_prefix=request.output_prefix,
-                silence_ms=request.silence_ms,
-                language=request.language,
-                exaggeration=request.exaggeration,
-                cfg_weight=request.cfg_weight,
-                save_individual=request.save_individual,
-                process_audio=request.process_audio,
-                device=request.device,
-                progress_callback=update_progress
-            )
+    # Generate the audio with progress tracking
+    output_path = create_dialogue_audio(
+        dialogue=dialogue,
+        output_prefix=request.output_prefix,
+        silence_ms=request.silence_ms,
+        language=request.language,
+        exaggeration=request.exaggeration,
+        cfg_weight=request.cfg_weight,
+        save_individual=request.save_individual,
+        process_audio=request.process_audio,
+        device=request.device,
+        progress_callback=progress_callback,
+        pipeline=_get_pipeline(request.device),
+        precision=request.precision,
+        use_cache=request.use_cache,
+        skip_processing_if_clean=request.skip_processing_if_clean
+    )
 
-            # Mark as completed
-            progress_data["status"] = "completed"
-            progress_data["message"] = "Generation complete!"
+    # Calculate duration from the WAV header instead of decoding every sample
+    duration_seconds = sf.info(str(output_path)).duration
 
-            # Calculate duration
-            import torchaudio as ta
-            waveform, sample_rate = ta.load(str(output_path))
-            duration_seconds = waveform.shape[1] / sample_rate
+    return output_path, len(dialogue), duration_seconds
 
-            # Build response
-            lines_dir = None
-            if request.save_individual:
-                lines_dir = str(output_path.parent / f"{request.output_prefix}_lines")
 
-            return GenerateDialogueResponse(
+def _forget_job(job_id: str):
+    """Drop a finished job's progress and result."""
+    progress_jobs.pop(job_id, None)
+    progress_versions.pop(job_id, None)
+    job_results.pop(job_id, None)
+
+
+async def _run_job(job_id: str, request: GenerateDialogueRequest):
+    """
+    Run a generation job in the background and store its outcome.
+
+    Args:
+        job_id: ID the job was registered under
+        request: Generation parameters including dialogue text and settings
+    """
+    loop = asyncio.get_running_loop()
+
+    def report_progress(data: dict):
+        # Called from the generation thread; asyncio objects aren't thread-safe
+        loop.call_soon_threadsafe(update_progress, job_id, dict(data))
+
+    def fail(status_code: int, error: str, e: Exception):
+        job_results[job_id] = {
+            "status_code": status_code,
+            "detail": {
+                "status": "error",
+                "error": error,
+                "details": str(e)
+            }
+        }
+        update_progress(job_id, {"status": "error", "message": str(e)})
+
+    try:
+        # One generation at a time (by default) keeps jobs from competing
+        # for the TTS device
+        async with generation_semaphore:
+            update_progress(job_id, {
+                "status": "generating_line",
+                "message": "Starting generation..."
+            })
+
+            # Run parsing and TTS off the event loop so progress streams,
+            # health checks and downloads keep being served meanwhile
+            output_path, num_lines, duration_seconds = await asyncio.to_thread(
+                _run_generation, request, report_progress
+            )
+
+        # Build response
+        lines_dir = None
+        if request.save_individual:
+            lines_dir = str(output_path.parent / f"{request.output_prefix}_lines")
+
+        job_results[job_id] = {
+            "response": GenerateDialogueResponse(
                 status="success",
+                job_id=job_id,
                 output_file=str(output_path),
                 lines_dir=lines_dir,
                 duration_seconds=float(duration_seconds),
-                num_lines=len(dialogue),
+                num_lines=num_lines,
                 timestamp=datetime.now().isoformat()
             )
+        }
 
-        finally:
-            # Clean up temporary file
-            try:
-                os.unlink(tmp_file_path)
-            except Exception:
-                pass
+        # Mark as completed once the result can be fetched
+        update_progress(job_id, {
+            "status": "completed",
+            "message": "Generation complete!"
+        })
+
+    except HTTPException as e:
+        job_results[job_id] = {"status_code": e.status_code, "detail": e.detail}
+        update_progress(job_id, {"status": "error", "message": str(e.detail)})
 
     except FileNotFoundError as e:
-        progress_data["status"] = "error"
-        progress_data["message"] = str(e)
-        raise HTTPException(
-            status_code=400,
-            detail={
-                "status": "error",
-                "error": "Voice file not found",
-                "details": str(e)
-            }
-        )
+        fail(400, "Voice file not found", e)
 
     except ValueError as e:
-        progress_data["status"] = "error"
-        progress_data["message"] = str(e)
-        raise HTTPException(
-            status_code=400,
-            detail={
-                "status": "error",
-                "error": "Invalid input",
-                "details": str(e)
-            }
-        )
+        fail(400, "Invalid input", e)
 
     except Exception as e:
-        progress_data["status"] = "error"
-        progress_data["message"] = str(e)
-        raise HTTPException(
-            status_code=500,
-            detail={
-                "status": "error",
-                "error": "Generation failed",
-                "details": str(e)
-            }
+        fail(500, "Generation failed", e)
+
+    finally:
+        # Keep the final state around for late streams and result requests
+        loop.call_later(JOB_RETENTION_SECONDS, _forget_job, job_id)
+
+
+@app.post(
+    "/api/generate-dialogue",
+    response_model=GenerateDialogueJobResponse,
+    status_code=202
+)
+async def generate_dialogue(request: GenerateDialogueRequest):
+    """
+    Submit a multi-speaker dialogue generation job.
+
+    Returns as soon as the job is queued. Follow it with
+    /api/progress-stream and fetch the outcome from /api/result/{job_id}.
+
+    Args:
+        request: Generation parameters including dialogue text and settings
+
+    Returns:
+        GenerateDialogueJobResponse with the job ID
+    """
+    job_id = uuid4().hex
+
+    progress_jobs[job_id] = {
+        "current_line": 0,
+        "total_lines": 0,
+        "status": "queued",
+        "message": "Waiting for other generations to finish..."
+    }
+    progress_versions[job_id] = 0
+
+    task = asyncio.create_task(_run_job(job_id, request))
+    _job_tasks.add(task)
+    task.add_done_callback(_job_tasks.discard)
+
+    return GenerateDialogueJobResponse(status="queued", job_id=job_id)
+
+
+@app.get(
+    "/api/result/{job_id}",
+    response_model=GenerateDialogueResponse,
+    responses={
+        202: {"model": GenerateDialogueJobResponse, "description": "Job still running"},
+        400: {"model": ErrorResponse, "description": "Bad request"},
+        404: {"model": ErrorResponse, "description": "Unknown job"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    }
+)
+async def get_result(job_id: str):
+    """
+    Fetch the outcome of a generation job.
+
+    Args:
+        job_id: ID returned by /api/generate-dialogue
+
+    Returns:
+        GenerateDialogueResponse once the job has completed, or a 202
+        response with the job's current status while it is still running
+
+    Raises:
+        HTTPException: If the job is unknown or failed
+    """
+    result = job_results.get(job_id)
+    if result is None:
+        job = progress_jobs.get(job_id)
+        if job is None:
+            raise HTTPException(
+                status_code=404,
+                detail={
+                    "status": "error",
+                    "error": "Job not found",
+                    "details": f"No job with ID '{job_id}' (it may have expired)"
+                }
+            )
+        return ORJSONResponse(
+            status_code=202,
+            content={"status": job["status"], "job_id": job_id}
         )
 
+    if "response" in result:
+        return result["response"]
+
+    raise HTTPException(status_code=result["status_code"], detail=result["detail"])
+
 
 @app.get("/api/download")
 async def download_file(path: str):
@@ -318,10 +567,12 @@ async def download_file(path: str):
         HTTPException: If file not found or path is invalid
     """
     try:
-        file_path = Path(path)
+        # Resolve ".." and symlinks before checking, so paths like
+        # "outputs/../secret" can't escape the outputs directory
+        file_path = Path(path).resolve()
 
         # Security: Only allow downloads from outputs directory
-        if not str(file_path).startswith("outputs"):
+        if not file_path.is_relative_to(OUTPUT_ROOT):
             raise HTTPException(
                 status_code=403,
                 detail={
@@ -331,7 +582,9 @@ async def download_file(path: str):
                 }
             )
 
-        if not file_path.exists():
+        # FileResponse only notices a missing file once the response has
+        # started, so check here to return a proper 404
+        if not file_path.is_file():
             raise HTTPException(
                 status_code=404,
                 detail={
@@ -341,8 +594,9 @@ async def download_file(path: str):
                 }
             )
 
+        # Starlette sends the file with sendfile() where the server supports it
         return FileResponse(
-            path=str(file_path),
+            path=file_path,
             media_type="audio/wav",
             filename=file_path.name
         )
@@ -6,11 +6,44 @@ This module is responsible only for text-based dialogue structure,
 not for audio generation.
 """
 
+import logging
 import re
-from typing import List, Dict, Optional
+from typing import Iterable, List, NamedTuple, Optional
 from pathlib import Path
 
 
+try:
+    # google-re2 matches in linear time with no backtracking blowup on
+    # unterminated quotes; its API mirrors re, so fall back to re without it
+    import re2 as _regex
+except ImportError:
+    _regex = re
+
+logger = logging.getLogger(__name__)
+
+
+class Turn(NamedTuple):
+    """A single dialogue turn."""
+    voice: str          # voice identifier (e.g., "voice1")
+    voice_path: str     # path to the voice template WAV file
+    text: str           # text to be spoken
+
+
+# Voice definitions and dialogue lines are matched in a single scan per line.
+# Groups: (1, 2) voiceN_wav="path", (3, 4) voiceN="text", (5, 6) voiceN='text'.
+# Dialogue text keeps the opening quote type so apostrophes survive inside
+# double-quoted lines.
+_DIALOGUE_TOKEN_RE = _regex.compile(
+    r'(voice\d+)_wav\s*=\s*["\']([^"\']+)["\']'
+    r'|(voice\d+)\s*=\s*"([^"]+)"'
+    r"|(voice\d+)\s*=\s*'([^']+)'"
+)
+
+# A dialogue line whose closing quote is not on the same line; the turn
+# continues on the following lines
+_OPEN_TURN_RE = _regex.compile(r'(voice\d+)\s*=\s*(?:"[^"]*|\'[^\']*)$')
+
+
 class DialogueParser:
     """
     Parses dialogue files and creates structured dialogue data.
@@ -33,7 +66,7 @@ class DialogueParser:
         """
         self.voices_dir = Path(voices_dir)
 
-    def parse_dialogue_file(self, filepath: str) -> List[Dict]:
+    def parse_dialogue_file(self, filepath: str) -> List[Turn]:
         """
         Read and parse a dialogue file.
 
@@ -41,104 +74,138 @@ class DialogueParser:
             filepath: Path to the dialogue file
 
         Returns:
-            List of dialogue turns, each containing:
-            - voice: voice identifier (e.g., "voice1")
-            - voice_path: path to the voice template WAV file
-            - text: text to be spoken
+            List of dialogue turns (Turn tuples of voice, voice_path, text)
 
         Raises:
-            FileNotFoundError: If the dialogue file doesn't exist
+            FileNotFoundError: If the dialogue file or a voice file doesn't exist
             ValueError: If no dialogue lines are found in the file
         """
         filepath = Path(filepath)
         if not filepath.exists():
             raise FileNotFoundError(f"Dialogue file not found: {filepath}")
 
+        # Stream the file so large scripts never sit in memory as one string
         with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Extract voice template paths
-        voice_paths = self._extract_voice_paths(content)
+            return self._parse_lines(f)
 
-        # Extract dialogue lines
-        dialogue_lines = self._extract_dialogue_lines(content, voice_paths)
+    def parse_dialogue_string(self, text: str) -> List[Turn]:
+        """
+        Parse dialogue content that is already in memory.
 
-        if len(dialogue_lines) == 0:
-            raise ValueError(
-                "No dialogue lines found in file. "
-                "Ensure the file contains:\n"
-                "1. Voice definitions: voice1_wav=\"path/to/voice.wav\"\n"
-                "2. Dialogue lines: voice1=\"Text to speak\""
-            )
+        Args:
+            text: Dialogue content in the same format as a dialogue file
 
-        # Validate and warn about short text
-        for i, line in enumerate(dialogue_lines, 1):
-            if len(line['text'].strip()) < 3:
-                print(f"WARNING: Line {i} has very short text ('{line['text']}') "
-                      f"and may cause TTS errors. Consider using longer phrases.")
+        Returns:
+            List of dialogue turns (same structure as parse_dialogue_file)
 
-        return dialogue_lines
+        Raises:
+            FileNotFoundError: If a voice file doesn't exist
+            ValueError: If no dialogue lines are found in the text
+        """
+        return self._parse_lines(text.splitlines(keepends=True))
 
-    def _extract_voice_paths(self, content: str) -> Dict[str, str]:
+    def _parse_lines(self, lines: Iterable[str]) -> List[Turn]:
         """
-        Extract voice template paths from dialogue content.
+        Parse dialogue lines and warn about very short text.
 
         Args:
-            content: Raw dialogue file content
+            lines: Iterable of raw dialogue lines
 
         Returns:
-            Dictionary mapping voice names to their template paths
+            List of dialogue turns
+
+        Raises:
+            ValueError: If no dialogue lines are found
+            FileNotFoundError: If any voice file used by the dialogue is missing
         """
-        voice_paths = {}
-        voice_pattern = r'(voice\d+)_wav\s*=\s*["\']([^"\']+)["\']'
+        numbered_lines = self._extract_dialogue(lines)
+
+        if len(numbered_lines) == 0:
+            raise ValueError(
+                "No dialogue lines found in file. "
+                "Ensure the file contains:\n"
+                "1. Voice definitions: voice1_wav=\"path/to/voice.wav\"\n"
+                "2. Dialogue lines: voice1=\"Text to speak\""
+            )
 
-        for match in re.finditer(voice_pattern, content):
-            voice_name = match.group(1)
-            voice_path = match.group(2)
-            voice_paths[voice_name] = voice_path
+        # Check every voice file up front, so a bad path fails before any
+        # audio is generated rather than partway through the dialogue
+        voice_paths = {line.voice_path for _, line in numbered_lines}
+        missing = sorted(path for path in voice_paths if not Path(path).is_file())
+        if missing:
+            raise FileNotFoundError(
+                f"Voice file(s) not found: {', '.join(missing)}"
+            )
 
-        return voice_paths
+        # Validate and warn about short text
+        for lineno, line in numbered_lines:
+            if len(line.text.strip()) < 3:
+                logger.warning("Line %d has very short text (%r) and may cause TTS errors. "
+                               "Consider using longer phrases.", lineno, line.text)
+
+        return [line for _, line in numbered_lines]
 
-    def _extract_dialogue_lines(self, content: str,
-                                voice_paths: Dict[str, str]) -> List[Dict]:
+    def _extract_dialogue(self, lines: Iterable[str]) -> List[tuple]:
         """
-        Extract dialogue lines from content.
+        Extract voice template paths and dialogue lines in one pass.
+
+        A quoted dialogue line may span several lines; it is carried over
+        until its closing quote. Voice definitions may appear anywhere, so
+        lines are resolved against the collected paths once the scan is done.
 
         Args:
-            content: Raw dialogue file content
-            voice_paths: Dictionary of voice name to path mappings
+            lines: Iterable of raw dialogue lines, with line endings (e.g. an
+                open file)
 
         Returns:
-            List of dialogue turn dictionaries
+            List of (line number, Turn) tuples
         """
-        dialogue_lines = []
-
-        # Updated pattern to handle quotes properly
-        # Matches: voice1="text" or voice1='text'
-        # Handles apostrophes inside the text by matching the opening quote type
-        dialogue_pattern = r'(voice\d+)\s*=\s*"([^"]+)"|' + r"(voice\d+)\s*=\s*'([^']+)'"
-
-        for match in re.finditer(dialogue_pattern, content):
-            # Check which group matched (double quotes or single quotes)
-            if match.group(1):  # Double quotes
-                voice_name = match.group(1)
-                text = match.group(2)
-            else:  # Single quotes
-                voice_name = match.group(3)
-                text = match.group(4)
-
-            # Only add lines that have an associated voice path
-            if voice_name in voice_paths:
-                dialogue_lines.append({
-                    'voice': voice_name,
-                    'voice_path': voice_paths[voice_name],
-                    'text': text
-                })
-
-        return dialogue_lines
-
-
-def load_dialogue(dialogue_file: str, voices_dir: str = "voices") -> List[Dict]:
+        voice_paths = {}
+        turns = []
+
+        # Unterminated dialogue line carried over, and the line it started on
+        pending = ''
+        pending_lineno = 0
+
+        for lineno, raw_line in enumerate(lines, 1):
+            if pending:
+                chunk, chunk_lineno = pending + raw_line, pending_lineno
+            else:
+                chunk, chunk_lineno = raw_line, lineno
+
+            end = 0
+            for match in _DIALOGUE_TOKEN_RE.finditer(chunk):
+                voice_def, voice_path, dq_voice, dq_text, sq_voice, sq_text = match.groups()
+                if voice_def:
+                    voice_paths[voice_def] = voice_path
+                else:
+                    turn_lineno = chunk_lineno + chunk.count('\n', 0, match.start())
+                    if dq_voice:
+                        turns.append((turn_lineno, dq_voice, dq_text))
+                    else:
+                        turns.append((turn_lineno, sq_voice, sq_text))
+                end = match.end()
+
+            open_turn = _OPEN_TURN_RE.search(chunk, end)
+            if open_turn:
+                pending = chunk[open_turn.start():]
+                pending_lineno = chunk_lineno + chunk.count('\n', 0, open_turn.start())
+            else:
+                pending = ''
+
+        if pending:
+            logger.warning("Line %d starts a dialogue line whose closing quote is "
+                           "missing; it was skipped.", pending_lineno)
+
+        # Only keep lines that have an associated voice path
+        return [
+            (lineno, Turn(voice, voice_paths[voice], text))
+            for lineno, voice, text in turns
+            if voice in voice_paths
+        ]
+
+
+def load_dialogue(dialogue_file: str, voices_dir: str = "voices") -> List[Turn]:
     """
     Convenience function to load and parse a dialogue file.
 
@@ -152,7 +219,7 @@ def load_dialogue(dialogue_file: str, voices_dir: str = "voices") -> List[Dict]:
     Example:
         >>> dialogue = load_dialogue("examples/conversation.txt")
         >>> for turn in dialogue:
-        ...     print(f"{turn['voice']}: {turn['text']}")
+        ...     print(f"{turn.voice}: {turn.text}")
     """
     parser = DialogueParser(voices_dir=voices_dir)
     return parser.parse_dialogue_file(dialogue_file)
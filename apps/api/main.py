@@ -12,6 +12,7 @@ Example:
 """
 
 import argparse
+import logging
 import sys
 from pathlib import Path
 
@@ -96,6 +97,18 @@ Examples:
         help='Disable audio processing (de-essing, normalization, fades)'
     )
 
+    parser.add_argument(
+        '--skip-clean-processing',
+        action='store_true',
+        help='Skip the high-pass and de-essing filters for lines whose level is already within the target band'
+    )
+
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Generate every line fresh instead of reusing cached audio'
+    )
+
     parser.add_argument(
         '-d', '--device',
         type=str,
@@ -104,6 +117,14 @@ Examples:
         help='Device to run on (default: cpu)'
     )
 
+    parser.add_argument(
+        '-p', '--precision',
+        type=str,
+        default='fp32',
+        choices=['fp32', 'fp16', 'bf16'],
+        help='T3 token generator precision on CUDA, ignored on CPU (default: fp32)'
+    )
+
     return parser.parse_args()
 
 
@@ -148,6 +169,9 @@ def main():
     """
     Main entry point for the dialogue generator.
     """
+    # Show library warnings (e.g. very short dialogue lines) on the console
+    logging.basicConfig(format="%(levelname)s: %(message)s")
+
     try:
         # Parse and validate arguments
         args = parse_arguments()
@@ -169,8 +193,8 @@ def main():
         # Print dialogue summary
         print("\n[*] Dialogue preview:")
         for i, turn in enumerate(dialogue[:3], 1):
-            text_preview = turn['text'][:60] + ('...' if len(turn['text']) > 60 else '')
-            print(f"  {i}. {turn['voice']}: {text_preview}")
+            text_preview = turn.text[:60] + ('...' if len(turn.text) > 60 else '')
+            print(f"  {i}. {turn.voice}: {text_preview}")
         if len(dialogue) > 3:
             print(f"  ... and {len(dialogue) - 3} more turns")
 
@@ -180,7 +204,10 @@ def main():
         print(f"   Silence between turns: {args.silence}ms")
         print(f"   Exaggeration: {args.exaggeration}")
         print(f"   Audio processing: {'disabled' if args.no_processing else 'enabled (de-essing, normalization, fades)'}")
+        print(f"   Line cache: {'disabled' if args.no_cache else 'enabled'}")
         print(f"   Device: {args.device}")
+        if args.device == 'cuda':
+            print(f"   Precision: {args.precision}")
 
         output_path = create_dialogue_audio(
             dialogue=dialogue,
@@ -191,7 +218,10 @@ def main():
             cfg_weight=args.cfg_weight,
             save_individual=not args.no_individual,
             process_audio=not args.no_processing,
-            device=args.device
+            device=args.device,
+            precision=args.precision,
+            use_cache=not args.no_cache,
+            skip_processing_if_clean=args.skip_clean_processing
         )
 
         # Success message
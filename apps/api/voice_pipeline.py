@@ -5,20 +5,124 @@ Handles TTS generation and audio processing using Chatterbox TTS.
 Converts structured dialogue data into WAV audio files.
 """
 
+import hashlib
+import math
 import os
 import re
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Optional
 
+import soundfile as sf
 import torch
 import torchaudio as ta
 import torchaudio.functional as F
 from chatterbox.mtl_tts import ChatterboxMultilingualTTS
 
+from apps.api.dialogue_generator import Turn
+
 
 # Output directory for generated audio files
 OUTPUT_DIR = Path("outputs")
 
+# Generated lines cached by content (voice, text and settings), so repeated
+# lines are read back from disk instead of being synthesized again. The least
+# recently used entries are evicted beyond TTS_CACHE_MAX_ENTRIES, down to
+# TTS_CACHE_PRUNE_TO so the directory is only scanned every so often.
+TTS_CACHE_DIR = OUTPUT_DIR / "cache"
+TTS_CACHE_MAX_ENTRIES = 1000
+TTS_CACHE_PRUNE_TO = 900
+
+# Autocast dtype for each supported inference precision (CUDA only)
+PRECISION_DTYPES = {
+    "fp32": None,
+    "fp16": torch.float16,
+    "bf16": torch.bfloat16,
+}
+
+# Text normalization patterns, compiled once at import time
+_EMAIL_RE = re.compile(r'\b([a-zA-Z0-9._-]+)@([a-zA-Z0-9._-]+\.[a-zA-Z]{2,})\b')
+_URL_RE = re.compile(r'(https?://)?([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})(\/[^\s]*)?')
+_PHONE_RE = re.compile(r'(\+?\d{1,3})?[\s.-]?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}')
+_NONDIGIT_RE = re.compile(r'[^\d+]')
+_DIGIT_RE = re.compile(r'\d')
+_EMAIL_LOCAL_CHAR_RE = re.compile(r'[._-]')
+
+# Filename sanitization patterns for individual line files
+_FILENAME_DROP_RE = re.compile(r'[^\w\s-]')
+_FILENAME_SPACE_RE = re.compile(r'\s+')
+
+# Spoken form of the separator characters allowed in an email local part
+_EMAIL_LOCAL_WORDS = {'.': ' dot ', '_': ' underscore ', '-': ' dash '}
+
+# Phone digits are read one by one: '5' -> '5 ', '+' -> 'plus '
+_PHONE_TRANS = str.maketrans({'+': 'plus ', **{d: f'{d} ' for d in '0123456789'}})
+
+
+def _speak_email_local_char(match: re.Match) -> str:
+    """Return the spoken form of an email local-part separator."""
+    return _EMAIL_LOCAL_WORDS[match.group()]
+
+
+def _replace_email(match: re.Match) -> str:
+    """Convert a matched email address to speakable format."""
+    local_part = match.group(1)  # john.doe
+    domain_part = match.group(2)  # example.com
+
+    # Replace dots, underscores, hyphens in local part (single pass)
+    local_speakable = _EMAIL_LOCAL_CHAR_RE.sub(_speak_email_local_char, local_part)
+
+    # Replace dots in domain
+    domain_speakable = domain_part.replace('.', ' dot ')
+
+    return f"{local_speakable} at {domain_speakable}"
+
+
+def _replace_url(match: re.Match) -> str:
+    """Convert a matched URL to speakable format."""
+    protocol = match.group(1) or ''
+    domain = match.group(2)
+    path = match.group(3) or ''
+
+    parts: List[str] = []
+
+    # Handle protocol
+    if protocol:
+        if 'https' in protocol:
+            parts.append('H T T P S colon slash slash ')
+        elif 'http' in protocol:
+            parts.append('H T T P colon slash slash ')
+
+    # Handle www
+    if domain.startswith('www.'):
+        parts.append('W W W dot ')
+        domain = domain[4:]
+
+    # Replace dots in domain
+    parts.append(domain.replace('.', ' dot '))
+
+    # Skip path for now as it's complex
+    if path:
+        parts.append(' slash ')
+        parts.append(path.replace('/', ' slash ').strip())
+
+    return ''.join(parts)
+
+
+def _replace_phone(match: re.Match) -> str:
+    """Convert a matched phone number to speakable format."""
+    phone = match.group(0)
+    # Remove formatting characters
+    digits = _NONDIGIT_RE.sub('', phone)
+
+    # Convert to spoken format
+    return digits.translate(_PHONE_TRANS).strip()
+
 
 class TextNormalizer:
     """
@@ -41,22 +145,7 @@ class TextNormalizer:
         Returns:
             Text with emails converted to speakable format
         """
-        # Email regex pattern
-        email_pattern = r'\b([a-zA-Z0-9._-]+)@([a-zA-Z0-9._-]+\.[a-zA-Z]{2,})\b'
-
-        def replace_email(match):
-            local_part = match.group(1)  # john.doe
-            domain_part = match.group(2)  # example.com
-
-            # Replace dots, underscores, hyphens in local part
-            local_speakable = local_part.replace('.', ' dot ').replace('_', ' underscore ').replace('-', ' dash ')
-
-            # Replace dots in domain
-            domain_speakable = domain_part.replace('.', ' dot ')
-
-            return f"{local_speakable} at {domain_speakable}"
-
-        return re.sub(email_pattern, replace_email, text)
+        return _EMAIL_RE.sub(_replace_email, text)
 
     @staticmethod
     def normalize_url(text: str) -> str:
@@ -71,38 +160,7 @@ class TextNormalizer:
         Returns:
             Text with URLs converted to speakable format
         """
-        # Simple URL pattern
-        url_pattern = r'(https?://)?([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})(\/[^\s]*)?'
-
-        def replace_url(match):
-            protocol = match.group(1) or ''
-            domain = match.group(2)
-            path = match.group(3) or ''
-
-            result = ''
-
-            # Handle protocol
-            if protocol:
-                if 'https' in protocol:
-                    result += 'H T T P S colon slash slash '
-                elif 'http' in protocol:
-                    result += 'H T T P colon slash slash '
-
-            # Handle www
-            if domain.startswith('www.'):
-                result += 'W W W dot '
-                domain = domain[4:]
-
-            # Replace dots in domain
-            result += domain.replace('.', ' dot ')
-
-            # Skip path for now as it's complex
-            if path:
-                result += ' slash ' + path.replace('/', ' slash ').strip()
-
-            return result
-
-        return re.sub(url_pattern, replace_url, text)
+        return _URL_RE.sub(_replace_url, text)
 
     @staticmethod
     def normalize_phone(text: str) -> str:
@@ -117,25 +175,7 @@ class TextNormalizer:
         Returns:
             Text with phone numbers converted to speakable format
         """
-        # Phone number pattern (various formats)
-        phone_pattern = r'(\+?\d{1,3})?[\s.-]?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}'
-
-        def replace_phone(match):
-            phone = match.group(0)
-            # Remove formatting characters
-            digits = re.sub(r'[^\d+]', '', phone)
-
-            # Convert to spoken format
-            spoken = ''
-            for char in digits:
-                if char == '+':
-                    spoken += 'plus '
-                else:
-                    spoken += char + ' '
-
-            return spoken.strip()
-
-        return re.sub(phone_pattern, replace_phone, text)
+        return _PHONE_RE.sub(_replace_phone, text)
 
     @staticmethod
     def normalize_text(text: str, normalize_emails: bool = True,
@@ -155,18 +195,89 @@ class TextNormalizer:
         """
         result = text
 
-        if normalize_emails:
+        # Each pattern needs a specific character to match ('@' for emails,
+        # a dot for URLs, a digit for phones); skip the regex scan otherwise
+        if normalize_emails and '@' in result:
             result = TextNormalizer.normalize_email(result)
 
-        if normalize_urls:
+        if normalize_urls and '.' in result:
             result = TextNormalizer.normalize_url(result)
 
-        if normalize_phones:
+        if normalize_phones and _DIGIT_RE.search(result):
             result = TextNormalizer.normalize_phone(result)
 
         return result
 
 
+# Fade curves keyed by (device, dtype, num_samples, rising); the fade
+# lengths are constant across a dialogue, so each curve is built once
+_FADE_CACHE: Dict[tuple, torch.Tensor] = {}
+
+
+def _fade_curve(num_samples: int,
+                rising: bool,
+                device: torch.device,
+                dtype: torch.dtype) -> torch.Tensor:
+    """
+    Return a cached linear fade curve built directly on the target device.
+
+    Only rising ramps are generated; a falling curve is the rising ramp of
+    the same length reversed, so each length needs a single linspace.
+    """
+    key = (device, dtype, num_samples, rising)
+    curve = _FADE_CACHE.get(key)
+    if curve is None:
+        if rising:
+            curve = torch.linspace(0, 1, num_samples, device=device, dtype=dtype)
+        else:
+            curve = _fade_curve(num_samples, True, device, dtype).flip(0)
+        _FADE_CACHE[key] = curve
+    return curve
+
+
+@lru_cache(maxsize=None)
+def _deess_coefficients(sample_rate: int, reduction_db: float) -> tuple:
+    """
+    Compute biquad coefficients for the de-esser.
+
+    De-essing subtracts a band-passed copy of the signal and adds it back
+    scaled by the reduction factor: y = x + (g - 1) * BP(x). With the
+    band-pass written as B(z) / A(z), this is the single biquad
+    (A(z) + (g - 1) * B(z)) / A(z), which shares the band-pass poles.
+
+    Args:
+        sample_rate: Sample rate in Hz
+        reduction_db: Amount to reduce sibilants in dB
+
+    Returns:
+        Tuple of (b_coeffs, a_coeffs), each a tuple of three floats
+    """
+    # Sibilant frequency range: 5-8 kHz
+    sibilant_freq = 6500  # Center frequency for sibilants
+    Q = 0.7  # Quality factor (bandwidth)
+
+    # Band-pass coefficients, as in torchaudio.functional.bandpass_biquad
+    w0 = 2 * math.pi * sibilant_freq / sample_rate
+    alpha = math.sin(w0) / 2 / Q
+    a0, a1, a2 = 1 + alpha, -2 * math.cos(w0), 1 - alpha
+
+    # Fold the band reduction into the numerator
+    gain = 10 ** (reduction_db / 20) - 1.0
+    b_coeffs = (a0 + gain * alpha, a1, a2 - gain * alpha)
+    return b_coeffs, (a0, a1, a2)
+
+
+@lru_cache(maxsize=None)
+def _deess_filter(sample_rate: int,
+                  reduction_db: float,
+                  device: torch.device,
+                  dtype: torch.dtype) -> tuple:
+    """Return the de-esser coefficients as cached tensors on the target device."""
+    b_coeffs, a_coeffs = _deess_coefficients(sample_rate, reduction_db)
+    return (torch.tensor(b_coeffs, dtype=dtype, device=device),
+            torch.tensor(a_coeffs, dtype=dtype, device=device))
+
+
 class AudioProcessor:
     """
     Audio processing utilities for natural-sounding dialogue.
@@ -182,6 +293,10 @@ class AudioProcessor:
         """
         Apply smooth fade-in and fade-out to prevent hard transitions.
 
+        The fades are applied in place: only the edge samples are touched,
+        so the input tensor is modified and returned rather than copied.
+        Tensors that require grad are cloned first.
+
         Args:
             audio: Audio tensor (1, num_samples)
             sample_rate: Sample rate in Hz
@@ -189,7 +304,7 @@ class AudioProcessor:
             fade_out_ms: Fade-out duration in milliseconds
 
         Returns:
-            Audio with fades applied
+            Audio with fades applied (the same tensor as ``audio`` unless cloned)
         """
         num_samples = audio.shape[1]
         fade_in_samples = int(sample_rate * fade_in_ms / 1000)
@@ -199,20 +314,21 @@ class AudioProcessor:
         fade_in_samples = min(fade_in_samples, num_samples // 2)
         fade_out_samples = min(fade_out_samples, num_samples // 2)
 
-        # Manual fade implementation for compatibility
-        audio_copy = audio.clone()
+        # In-place edits on a leaf that requires grad are not allowed
+        if audio.requires_grad:
+            audio = audio.clone()
 
         # Fade in
         if fade_in_samples > 0:
-            fade_in_curve = torch.linspace(0, 1, fade_in_samples).to(audio.device)
-            audio_copy[:, :fade_in_samples] *= fade_in_curve
+            fade_in_curve = _fade_curve(fade_in_samples, True, audio.device, audio.dtype)
+            audio[:, :fade_in_samples].mul_(fade_in_curve)
 
         # Fade out
         if fade_out_samples > 0:
-            fade_out_curve = torch.linspace(1, 0, fade_out_samples).to(audio.device)
-            audio_copy[:, -fade_out_samples:] *= fade_out_curve
+            fade_out_curve = _fade_curve(fade_out_samples, False, audio.device, audio.dtype)
+            audio[:, -fade_out_samples:].mul_(fade_out_curve)
 
-        return audio_copy
+        return audio
 
     @staticmethod
     def normalize_rms(audio: torch.Tensor, target_rms: float = 0.1) -> torch.Tensor:
@@ -226,17 +342,19 @@ class AudioProcessor:
         Returns:
             Normalized audio
         """
-        # Calculate current RMS
-        rms = torch.sqrt(torch.mean(audio ** 2))
+        # Calculate current RMS and peak (kept as tensors: no host sync)
+        rms = audio.pow(2).mean().sqrt()
+        peak = audio.abs().amax()
 
-        # Avoid division by zero
-        if rms > 1e-8:
-            scaling_factor = target_rms / rms
-            # Prevent clipping by capping the scaling factor
-            scaling_factor = min(scaling_factor, 1.0 / (torch.max(torch.abs(audio)).item() + 1e-8))
-            audio = audio * scaling_factor
+        # Prevent clipping by capping the scaling factor
+        scaling_factor = torch.minimum(target_rms / rms.clamp_min(1e-8),
+                                       1.0 / (peak + 1e-8))
 
-        return audio
+        # Leave (near-)silent audio untouched to avoid division by zero
+        scaling_factor = torch.where(rms > 1e-8, scaling_factor,
+                                     torch.ones_like(scaling_factor))
+
+        return audio * scaling_factor
 
     @staticmethod
     def high_pass_filter(audio: torch.Tensor,
@@ -272,22 +390,34 @@ class AudioProcessor:
         Returns:
             De-essed audio
         """
-        # Sibilant frequency range: 5-8 kHz
-        # Apply bandpass to isolate sibilants
-        sibilant_freq = 6500  # Center frequency for sibilants
-        Q = 0.7  # Quality factor (bandwidth)
+        b_coeffs, a_coeffs = _deess_filter(
+            sample_rate, reduction_db, audio.device, audio.dtype
+        )
 
-        # Extract sibilant band
-        sibilant_band = F.bandpass_biquad(audio, sample_rate, sibilant_freq, Q)
+        # Single IIR pass equivalent to audio - band + band * reduction_factor
+        return F.lfilter(audio, a_coeffs, b_coeffs, clamp=False)
 
-        # Reduce sibilant band
-        reduction_factor = 10 ** (reduction_db / 20)
-        sibilant_band_reduced = sibilant_band * reduction_factor
+    @staticmethod
+    def is_clean(audio: torch.Tensor,
+                 min_rms: float = 0.05,
+                 max_rms: float = 0.3,
+                 max_peak: float = 0.99) -> bool:
+        """
+        Check whether audio is already at a usable level with headroom.
 
-        # Subtract reduced sibilants from original
-        audio_deessed = audio - sibilant_band + sibilant_band_reduced
+        Args:
+            audio: Audio tensor (1, num_samples)
+            min_rms: Lowest acceptable RMS level
+            max_rms: Highest acceptable RMS level
+            max_peak: Highest acceptable absolute peak
 
-        return audio_deessed
+        Returns:
+            True if the RMS is within (min_rms, max_rms) and the peak is
+            below max_peak
+        """
+        rms = audio.pow(2).mean().sqrt()
+        peak = audio.abs().amax()
+        return bool((rms > min_rms) & (rms < max_rms) & (peak < max_peak))
 
     @staticmethod
     def process_line(audio: torch.Tensor,
@@ -295,10 +425,14 @@ class AudioProcessor:
                     apply_deess: bool = True,
                     apply_normalize: bool = True,
                     apply_highpass: bool = True,
-                    apply_fade: bool = True) -> torch.Tensor:
+                    apply_fade: bool = True,
+                    skip_if_clean: bool = False) -> torch.Tensor:
         """
         Apply full audio processing pipeline to a dialogue line.
 
+        The fade step works in place, so ``audio`` may be modified. This is
+        safe for freshly generated TTS output, which is never reused.
+
         Args:
             audio: Audio tensor (1, num_samples)
             sample_rate: Sample rate in Hz
@@ -306,10 +440,16 @@ class AudioProcessor:
             apply_normalize: Enable RMS normalization
             apply_highpass: Enable high-pass filter for breathing removal
             apply_fade: Enable fade-in/fade-out
+            skip_if_clean: Skip the high-pass and de-essing filters when the
+                line is already clean (see is_clean); normalization and fades
+                still run so line loudness stays consistent
 
         Returns:
             Processed audio
         """
+        if skip_if_clean and AudioProcessor.is_clean(audio):
+            apply_highpass = apply_deess = False
+
         # High-pass filter to remove breathing (do first to clean signal)
         if apply_highpass:
             audio = AudioProcessor.high_pass_filter(audio, sample_rate)
@@ -329,6 +469,11 @@ class AudioProcessor:
         return audio
 
 
+def _to_frames(audio: torch.Tensor):
+    """Convert a (channels, num_samples) tensor to a (frames, channels) array."""
+    return audio.detach().cpu().t().contiguous().numpy()
+
+
 class VoicePipeline:
     """
     Manages TTS generation and audio assembly for dialogues.
@@ -337,29 +482,67 @@ class VoicePipeline:
     voice cloning capabilities.
     """
 
-    def __init__(self, device: str = "cpu"):
+    def __init__(self,
+                 device: str = "cpu",
+                 autocast_dtype: Optional[torch.dtype] = None):
         """
         Initialize the voice pipeline with Chatterbox TTS.
 
         Args:
             device: Device to run the model on ("cpu" or "cuda")
+            autocast_dtype: Mixed-precision dtype for the T3 token generator
+                on CUDA (torch.bfloat16 or torch.float16); None (default)
+                runs in full FP32. Ignored on CPU.
         """
         self.device = device
         self.map_location = torch.device(device)
-
-        # Patch torch.load to use the specified device
-        self._patch_torch_load()
+        self.autocast_dtype = autocast_dtype
 
         print("[*] Loading ChatterboxMultilingualTTS model...")
-        self.model = ChatterboxMultilingualTTS.from_pretrained(device=device)
+        with self._patched_torch_load():
+            self.model = ChatterboxMultilingualTTS.from_pretrained(device=device)
         self.sr = self.model.sr
         print(f"[+] Model loaded successfully! Sample rate: {self.sr} Hz")
 
-    def _patch_torch_load(self):
+        # Autocast dtype for the T3 pass of the generation in progress
+        # (set under _model_lock)
+        self._t3_dtype: Optional[torch.dtype] = None
+        self._scope_autocast_to_t3()
+
+        # Voice conditionals (speaker embedding + prompt tokens) keyed by
+        # resolved voice path, stored with the file's (size, mtime) so a
+        # replaced voice file is re-encoded
+        self._voice_cache: Dict[str, tuple] = {}
+
+        # Silence tensors keyed by (duration_ms, device), shared between gaps
+        self._silence_cache: Dict[tuple, torch.Tensor] = {}
+
+        # Number of entries in TTS_CACHE_DIR, counted on the first store and
+        # kept up to date by this pipeline's stores and evictions
+        self._cache_entries: Optional[int] = None
+        self._cache_lock = threading.Lock()
+
+        # The model's conditionals are swapped per voice, so threads sharing
+        # this pipeline take turns running it
+        self._model_lock = threading.Lock()
+
+        # Set once a warm-up generation has run
+        self._warmed_up = False
+
+    @contextmanager
+    def _patched_torch_load(self):
         """
-        Patch torch.load to automatically use the configured device.
-        This prevents CUDA errors when loading on CPU.
+        Temporarily patch torch.load to default to the configured device.
+
+        This prevents CUDA errors when loading CUDA-saved checkpoints on CPU.
+        The original torch.load is restored on exit, so the patch neither
+        outlives model loading nor stacks across VoicePipeline instances.
+        On CUDA no patch is needed.
         """
+        if self.map_location.type == 'cuda':
+            yield
+            return
+
         torch_load_original = torch.load
 
         def patched_torch_load(*args, **kwargs):
@@ -368,6 +551,123 @@ class VoicePipeline:
             return torch_load_original(*args, **kwargs)
 
         torch.load = patched_torch_load
+        try:
+            yield
+        finally:
+            torch.load = torch_load_original
+
+    def _autocast_dtype(self, precision: Optional[str] = None) -> Optional[torch.dtype]:
+        """
+        Resolve the autocast dtype for an inference precision.
+
+        Args:
+            precision: "fp32", "fp16" or "bf16"; None uses the pipeline's
+                autocast_dtype
+
+        Returns:
+            Autocast dtype, or None for full FP32
+
+        Raises:
+            ValueError: If the precision is not supported
+        """
+        if precision is None:
+            return self.autocast_dtype
+        if precision not in PRECISION_DTYPES:
+            raise ValueError(
+                f"Unsupported precision: '{precision}'. "
+                f"Choose one of: {', '.join(PRECISION_DTYPES)}"
+            )
+        return PRECISION_DTYPES[precision]
+
+    def _scope_autocast_to_t3(self):
+        """
+        Run only the T3 token generator under mixed precision.
+
+        generate() also runs the S3Gen vocoder (istft/complex ops) and the
+        numpy watermarker, which need full-precision tensors, so autocast
+        wraps t3.inference() alone instead of the whole generate() call.
+        """
+        t3_inference = self.model.t3.inference
+
+        def inference(*args, **kwargs):
+            dtype = self._t3_dtype
+            with torch.autocast(
+                device_type=self.map_location.type,
+                dtype=dtype,
+                enabled=self.map_location.type == 'cuda' and dtype is not None
+            ):
+                return t3_inference(*args, **kwargs)
+
+        self.model.t3.inference = inference
+
+    @contextmanager
+    def _t3_precision(self, precision: Optional[str] = None):
+        """
+        Set the T3 autocast precision for generations inside the block.
+
+        Callers must hold _model_lock.
+
+        Args:
+            precision: "fp32", "fp16" or "bf16"; None uses the pipeline's
+                autocast_dtype
+
+        Raises:
+            ValueError: If the precision is not supported
+        """
+        self._t3_dtype = self._autocast_dtype(precision)
+        try:
+            yield
+        finally:
+            self._t3_dtype = None
+
+    def warm_up(self):
+        """
+        Run a short generation so the first real line starts warm.
+
+        Uses the model's built-in voice and is skipped if it has none, or if
+        the pipeline has already been warmed up.
+        """
+        if self._warmed_up or self.model.conds is None:
+            return
+
+        with self._model_lock, torch.inference_mode(), self._t3_precision():
+            self.model.generate("Warming up the voice model.", language_id='en')
+        self._warmed_up = True
+
+    @staticmethod
+    def _voice_file_id(voice_path: str) -> tuple:
+        """
+        Identify a voice file by its resolved path, size and modification time.
+
+        Returns:
+            Tuple of (resolved path, size in bytes, mtime in nanoseconds)
+        """
+        voice_stat = os.stat(voice_path)
+        return (str(Path(voice_path).resolve()),
+                voice_stat.st_size,
+                voice_stat.st_mtime_ns)
+
+    def _prepare_voice(self, voice_path: str, exaggeration: float):
+        """
+        Load the conditionals for a voice into the model.
+
+        Chatterbox re-reads and re-encodes the voice prompt on every
+        generate() call that passes audio_prompt_path. Instead, each voice
+        is encoded once with prepare_conditionals() and the resulting
+        conditionals are swapped back in whenever that speaker returns.
+
+        Args:
+            voice_path: Path to the voice template WAV file
+            exaggeration: Expression intensity used for the conditionals
+                (generate() updates it if a later line asks for another value)
+        """
+        resolved_path, size, mtime_ns = self._voice_file_id(voice_path)
+        cached = self._voice_cache.get(resolved_path)
+        if cached is not None and cached[0] == (size, mtime_ns):
+            self.model.conds = cached[1]
+        else:
+            self.model.prepare_conditionals(voice_path, exaggeration=exaggeration)
+            self._voice_cache[resolved_path] = ((size, mtime_ns), self.model.conds)
 
     def generate_line(self,
                      text: str,
@@ -376,7 +676,10 @@ class VoicePipeline:
                      exaggeration: float = 1.5,
                      cfg_weight: float = 0.5,
                      process_audio: bool = True,
-                     normalize_text: bool = True) -> torch.Tensor:
+                     normalize_text: bool = True,
+                     precision: Optional[str] = None,
+                     use_cache: bool = True,
+                     skip_processing_if_clean: bool = False) -> torch.Tensor:
         """
         Generate audio for a single dialogue line.
 
@@ -388,12 +691,19 @@ class VoicePipeline:
             cfg_weight: Configuration weight (0.0-1.0, default 0.5)
             process_audio: Apply audio processing (de-essing, normalization, etc.)
             normalize_text: Normalize text (emails, URLs, etc.) for better pronunciation
+            precision: T3 inference precision on CUDA ("fp32", "fp16" or "bf16");
+                None uses the pipeline's autocast_dtype
+            use_cache: Reuse audio cached for the same voice, text and settings
+                (disable to get a fresh take)
+            skip_processing_if_clean: Skip the high-pass and de-essing filters
+                for lines whose level is already within the target band
 
         Returns:
             Audio tensor (1, num_samples)
 
         Raises:
-            ValueError: If text is too short (less than 3 characters)
+            ValueError: If text is too short (less than 3 characters) or the
+                precision is not supported
         """
         # Normalize text for better TTS pronunciation
         if normalize_text:
@@ -412,35 +722,187 @@ class VoicePipeline:
         text_preview = text[:50] + ('...' if len(text) > 50 else '')
         print(f"  [>] Generating: '{text_preview}'")
 
-        wav = self.model.generate(
+        wav = None
+        cache_file = None
+        if use_cache:
+            cache_key = self._cache_key(text, voice_path, language_id,
+                                        exaggeration, cfg_weight, precision)
+            cache_file = TTS_CACHE_DIR / f"{cache_key}.wav"
+            wav = self._load_cached_line(cache_file)
+            if wav is not None:
+                print("  [i] Reused cached audio")
+
+        with torch.inference_mode():
+            if wav is None:
+                with self._model_lock, self._t3_precision(precision):
+                    self._prepare_voice(voice_path, exaggeration)
+
+                    wav = self.model.generate(
+                        text,
+                        exaggeration=exaggeration,
+                        cfg_weight=cfg_weight,
+                        language_id=language_id
+                    )
+
+                if cache_file is not None:
+                    self._store_cached_line(wav, cache_file)
+
+            # Apply audio processing to remove artifacts and improve naturalness
+            if process_audio:
+                wav = AudioProcessor.process_line(
+                    wav, self.sr, skip_if_clean=skip_processing_if_clean
+                )
+
+        return wav
+
+    def _cache_key(self,
+                   text: str,
+                   voice_path: str,
+                   language_id: str,
+                   exaggeration: float,
+                   cfg_weight: float,
+                   precision: Optional[str]) -> str:
+        """
+        Build the cache key for a generated line.
+
+        The key covers everything that changes the model output: the voice
+        file (by path, size and modification time), the final text, the
+        generation settings and the effective inference precision.
+
+        Returns:
+            Hex digest naming the cache file
+        """
+        dtype = self._autocast_dtype(precision) if self.map_location.type == 'cuda' else None
+        parts = (
+            *(str(part) for part in self._voice_file_id(voice_path)),
             text,
-            audio_prompt_path=voice_path,
-            exaggeration=exaggeration,
-            cfg_weight=cfg_weight,
-            language_id=language_id
+            language_id,
+            repr(float(exaggeration)),
+            repr(float(cfg_weight)),
+            self.map_location.type,
+            str(dtype),
         )
 
-        # Apply audio processing to remove artifacts and improve naturalness
-        if process_audio:
-            wav = AudioProcessor.process_line(wav, self.sr)
+        digest = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\x00')
+        return digest.hexdigest()
 
+    def _load_cached_line(self, cache_file: Path) -> Optional[torch.Tensor]:
+        """
+        Load a cached line, marking it as recently used.
+
+        Returns:
+            Audio tensor (1, num_samples), or None on a cache miss
+        """
+        try:
+            wav, _ = ta.load(str(cache_file))
+        except (OSError, RuntimeError):
+            return None
+        try:
+            os.utime(cache_file)
+        except OSError:
+            pass
         return wav
 
-    def create_silence(self, duration_ms: int = 500) -> torch.Tensor:
+    def _store_cached_line(self, wav: torch.Tensor, cache_file: Path):
+        """
+        Write a generated line to the cache, evicting old entries if it is full.
+
+        The file is written under a temporary name and renamed into place,
+        so concurrent readers never see a partial file. The cache is
+        best-effort: if it can't be written, generation carries on without it.
+        """
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, suffix='.tmp')
+            os.close(fd)
+            try:
+                sf.write(tmp_path, _to_frames(wav), self.sr,
+                         subtype='FLOAT', format='WAV')
+                os.replace(tmp_path, cache_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+            with self._cache_lock:
+                if self._cache_entries is None:
+                    self._cache_entries = len(self._cache_entries_by_age(cache_file.parent))
+                else:
+                    self._cache_entries += 1
+                if self._cache_entries > TTS_CACHE_MAX_ENTRIES:
+                    self._cache_entries = self._evict_cached_lines(cache_file.parent)
+        except (OSError, RuntimeError) as e:
+            print(f"  [!] Could not cache generated audio: {e}")
+
+    @staticmethod
+    def _cache_entries_by_age(cache_dir: Path) -> List[tuple]:
+        """
+        List the cached lines, least recently used first (hits refresh the mtime).
+
+        Returns:
+            List of (mtime, path) tuples
+        """
+        entries = []
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith('.wav'):
+                    continue
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except FileNotFoundError:
+                    pass
+        entries.sort()
+        return entries
+
+    @classmethod
+    def _evict_cached_lines(cls, cache_dir: Path) -> int:
+        """
+        Evict the least recently used cached lines down to TTS_CACHE_PRUNE_TO.
+
+        Returns:
+            Number of entries left in the cache
+        """
+        entries = cls._cache_entries_by_age(cache_dir)
+        if len(entries) <= TTS_CACHE_MAX_ENTRIES:
+            return len(entries)
+
+        evict = len(entries) - TTS_CACHE_PRUNE_TO
+        for _, path in entries[:evict]:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+        return TTS_CACHE_PRUNE_TO
+
+    def create_silence(self,
+                       duration_ms: int = 500,
+                       device: Optional[torch.device] = None) -> torch.Tensor:
         """
         Create silence between dialogue lines.
 
+        The tensor is cached and shared between calls, so callers must not
+        modify it in place (torch.cat only reads it).
+
         Args:
             duration_ms: Duration of silence in milliseconds
+            device: Device to allocate the silence on (default: CPU)
 
         Returns:
             Silent audio tensor
         """
-        silence_samples = int(self.sr * duration_ms / 1000)
-        return torch.zeros(1, silence_samples)
+        device = torch.device(device or 'cpu')
+        key = (duration_ms, device)
+        silence = self._silence_cache.get(key)
+        if silence is None:
+            silence_samples = int(self.sr * duration_ms / 1000)
+            silence = torch.zeros(1, silence_samples, device=device)
+            self._silence_cache[key] = silence
+        return silence
 
     def dialogue_to_audio(self,
-                         dialogue: List[Dict],
+                         dialogue: List[Turn],
                          output_prefix: str = "conversation",
                          silence_between: int = 500,
                          language_id: str = 'en',
@@ -449,10 +911,16 @@ class VoicePipeline:
                          save_individual: bool = True,
                          process_audio: bool = True,
                          normalize_text: bool = True,
-                         progress_callback: Optional[callable] = None) -> Path:
+                         progress_callback: Optional[callable] = None,
+                         precision: Optional[str] = None,
+                         use_cache: bool = True,
+                         skip_processing_if_clean: bool = False) -> Path:
         """
         Convert dialogue turns into a single WAV file.
 
+        Lines are written to the output file as they are generated, so
+        memory use does not grow with the length of the conversation.
+
         Args:
             dialogue: List of dialogue turns from dialogue_generator
             output_prefix: Prefix for output filename (without extension)
@@ -463,6 +931,14 @@ class VoicePipeline:
             save_individual: If True, save each line as a separate file
             process_audio: Apply audio processing to remove artifacts (default True)
             normalize_text: Normalize text (emails, URLs) for better pronunciation (default True)
+            progress_callback: Called with progress updates during generation
+            precision: T3 inference precision on CUDA ("fp32", "fp16" or "bf16");
+                None uses the pipeline's autocast_dtype
+            use_cache: Reuse cached audio for lines already generated with the
+                same voice, text and settings (default True)
+            skip_processing_if_clean: Skip the high-pass and de-essing filters
+                for lines whose level is already within the target band
+                (default False)
 
         Returns:
             Path to the generated WAV file
@@ -486,72 +962,158 @@ class VoicePipeline:
             individual_folder.mkdir(parents=True, exist_ok=True)
             print(f"[*] Saving individual lines to: {individual_folder}\n")
 
-        # Generate audio for all lines
-        audio_segments = []
+        # Stream every segment straight into the output file instead of
+        # holding the whole conversation in memory for one torch.cat.
+        # Post-processing and writing of line i run on a worker thread
+        # while the model generates line i + 1; a single worker keeps the
+        # writes in dialogue order.
+        total_samples = 0
+
+        # One silence buffer, allocated and converted to frames once, is
+        # written for every gap
+        silence_frames = _to_frames(self.create_silence(silence_between))
+
+        with self._open_output(output_file) as writer, \
+                ThreadPoolExecutor(max_workers=1) as executor:
+            pending = deque()
+
+            for i, line in enumerate(dialogue, 1):
+                # Surface worker errors before generating another line
+                while pending and pending[0].done():
+                    total_samples += pending.popleft().result()
+
+                print(f"[{i}/{len(dialogue)}] {line.voice}:")
+
+                # Update progress
+                if progress_callback:
+                    progress_callback({
+                        "current_line": i,
+                        "total_lines": len(dialogue),
+                        "status": "generating_line",
+                        "message": f"Generating line {i} of {len(dialogue)}..."
+                    })
+
+                # Generate audio for this line
+                wav = self.generate_line(
+                    text=line.text,
+                    voice_path=line.voice_path,
+                    language_id=language_id,
+                    exaggeration=exaggeration,
+                    cfg_weight=cfg_weight,
+                    process_audio=False,
+                    normalize_text=normalize_text,
+                    precision=precision,
+                    use_cache=use_cache
+                )
+
+                # Process, save and write the line in the background, followed
+                # by a pause (except after the last line)
+                pending.append(executor.submit(
+                    self._finish_line, wav, line, i, writer,
+                    individual_folder, process_audio, skip_processing_if_clean,
+                    silence_frames if i < len(dialogue) else None
+                ))
 
-        for i, line in enumerate(dialogue, 1):
-            print(f"[{i}/{len(dialogue)}] {line['voice']}:")
+            for future in pending:
+                total_samples += future.result()
 
-            # Update progress
+            print("\n[*] Finalizing audio file...")
             if progress_callback:
                 progress_callback({
-                    "current_line": i,
+                    "current_line": len(dialogue),
                     "total_lines": len(dialogue),
-                    "status": "generating_line",
-                    "message": f"Generating line {i} of {len(dialogue)}..."
+                    "status": "merging",
+                    "message": "Assembling final conversation..."
                 })
 
-            # Generate audio for this line
-            wav = self.generate_line(
-                text=line['text'],
-                voice_path=line['voice_path'],
-                language_id=language_id,
-                exaggeration=exaggeration,
-                cfg_weight=cfg_weight,
-                process_audio=process_audio,
-                normalize_text=normalize_text
-            )
+        # Calculate duration
+        duration = total_samples / self.sr
+
+        print(f"\n[+] Dialogue completed!")
+        print(f"[+] File saved: {output_file}")
+        print(f"[+] Duration: {duration:.2f} seconds")
 
-            # Save individual line if requested
-            if save_individual and individual_folder:
-                individual_file = self._save_individual_line(
-                    wav, line, i, individual_folder
+        return output_file
+
+    def _finish_line(self,
+                     wav: torch.Tensor,
+                     line: Turn,
+                     index: int,
+                     writer: sf.SoundFile,
+                     individual_folder: Optional[Path],
+                     process_audio: bool,
+                     skip_processing_if_clean: bool,
+                     silence_frames) -> int:
+        """
+        Post-process a generated line and append it to the conversation.
+
+        Runs on the dialogue worker thread, overlapping with generation of
+        the next line.
+
+        Args:
+            wav: Raw audio tensor from generate_line
+            line: Dialogue turn
+            index: Line number (1-indexed)
+            writer: Open output file
+            individual_folder: Directory for individual line files, or None
+            process_audio: Apply audio processing (de-essing, normalization, etc.)
+            skip_processing_if_clean: Skip the filters if the line is already clean
+            silence_frames: Pause to write after the line, as frames from
+                _to_frames(), or None for no pause
+
+        Returns:
+            Number of samples written to the output file
+        """
+        # Inference mode is thread-local, and the fades work in place on
+        # the inference tensor returned by generate_line
+        if process_audio:
+            with torch.inference_mode():
+                wav = AudioProcessor.process_line(
+                    wav, self.sr, skip_if_clean=skip_processing_if_clean
                 )
-                print(f"  [+] Saved: {individual_file.name}")
 
-            audio_segments.append(wav)
+        # Save individual line if requested
+        if individual_folder:
+            individual_file = self._save_individual_line(
+                wav, line, index, individual_folder
+            )
+            print(f"  [+] Saved: {individual_file.name}")
 
-            # Add pause between lines (except after the last line)
-            if i < len(dialogue):
-                silence = self.create_silence(silence_between)
-                audio_segments.append(silence)
+        writer.write(_to_frames(wav))
+        num_samples = wav.shape[1]
 
-        # Concatenate all audio segments
-        print("\n[*] Merging audio segments...")
-        if progress_callback:
-            progress_callback({
-                "current_line": len(dialogue),
-                "total_lines": len(dialogue),
-                "status": "merging",
-                "message": "Assembling final conversation..."
-            })
-        full_dialogue = torch.cat(audio_segments, dim=1)
+        if silence_frames is not None:
+            writer.write(silence_frames)
+            num_samples += len(silence_frames)
 
-        # Save the final audio file
-        ta.save(str(output_file), full_dialogue, self.sr)
+        return num_samples
 
-        # Calculate duration
-        duration = full_dialogue.shape[1] / self.sr
+    @contextmanager
+    def _open_output(self, output_file: Path):
+        """
+        Open the conversation WAV file for incremental writing.
 
-        print(f"\n[+] Dialogue completed!")
-        print(f"[+] File saved: {output_file}")
-        print(f"[+] Duration: {duration:.2f} seconds")
+        The file uses 32-bit float samples, matching what torchaudio.save
+        writes for float tensors. If generation fails part-way, the
+        truncated file is removed.
 
-        return output_file
+        Args:
+            output_file: Path of the WAV file to create
+
+        Yields:
+            Open soundfile.SoundFile in write mode
+        """
+        try:
+            with sf.SoundFile(str(output_file), mode='w', samplerate=self.sr,
+                              channels=1, subtype='FLOAT') as writer:
+                yield writer
+        except BaseException:
+            output_file.unlink(missing_ok=True)
+            raise
 
     def _save_individual_line(self,
                              wav: torch.Tensor,
-                             line: Dict,
+                             line: Turn,
                              index: int,
                              folder: Path) -> Path:
         """
@@ -559,7 +1121,7 @@ class VoicePipeline:
 
         Args:
             wav: Audio tensor
-            line: Dialogue line dictionary
+            line: Dialogue turn
             index: Line number (1-indexed)
             folder: Directory to save the file
 
@@ -567,17 +1129,30 @@ class VoicePipeline:
             Path to the saved file
         """
         # Create clean filename from text
-        clean_text = re.sub(r'[^\w\s-]', '', line['text'][:30])
-        clean_text = re.sub(r'\s+', '_', clean_text)
+        clean_text = _FILENAME_DROP_RE.sub('', line.text[:30])
+        clean_text = _FILENAME_SPACE_RE.sub('_', clean_text)
 
-        filename = f"{index:03d}_{line['voice']}_{clean_text}.wav"
+        filename = f"{index:03d}_{line.voice}_{clean_text}.wav"
         filepath = folder / filename
 
-        ta.save(str(filepath), wav, self.sr)
+        return self.save_wav(wav, filepath)
+
+    def save_wav(self, wav: torch.Tensor, filepath: Path) -> Path:
+        """
+        Save generated audio as a WAV file at the model's sample rate.
+
+        Args:
+            wav: Audio tensor (1, num_samples), on any device
+            filepath: Destination path
+
+        Returns:
+            Path to the saved file
+        """
+        ta.save(str(filepath), wav.cpu(), self.sr)
         return filepath
 
 
-def create_dialogue_audio(dialogue: List[Dict],
+def create_dialogue_audio(dialogue: List[Turn],
                          output_prefix: str = "conversation",
                          silence_ms: int = 500,
                          language: str = 'en',
@@ -587,7 +1162,11 @@ def create_dialogue_audio(dialogue: List[Dict],
                          process_audio: bool = True,
                          normalize_text: bool = True,
                          device: str = "cpu",
-                         progress_callback: Optional[callable] = None) -> Path:
+                         progress_callback: Optional[callable] = None,
+                         pipeline: Optional[VoicePipeline] = None,
+                         precision: str = "fp32",
+                         use_cache: bool = True,
+                         skip_processing_if_clean: bool = False) -> Path:
     """
     Convenience function to generate audio from dialogue data.
 
@@ -602,6 +1181,14 @@ def create_dialogue_audio(dialogue: List[Dict],
         process_audio: Apply audio processing to remove artifacts (default True)
         normalize_text: Normalize text (emails, URLs) for pronunciation (default True)
         device: Device to run on ("cpu" or "cuda")
+        progress_callback: Called with progress updates during generation
+        pipeline: Already loaded pipeline to reuse; if None, a new one is
+            loaded on `device`
+        precision: Inference precision of the T3 token generator on CUDA
+            ("fp32", "fp16" or "bf16", default "fp32"); ignored on CPU
+        use_cache: Reuse cached audio for repeated lines (default True)
+        skip_processing_if_clean: Skip the high-pass and de-essing filters for
+            lines that are already at a good level (default False)
 
     Returns:
         Path to the generated WAV file
@@ -611,7 +1198,8 @@ def create_dialogue_audio(dialogue: List[Dict],
         >>> dialogue = load_dialogue("examples/conversation.txt")
         >>> output = create_dialogue_audio(dialogue, output_prefix="my_conversation")
     """
-    pipeline = VoicePipeline(device=device)
+    if pipeline is None:
+        pipeline = VoicePipeline(device=device)
     return pipeline.dialogue_to_audio(
         dialogue=dialogue,
         output_prefix=output_prefix,
@@ -622,5 +1210,8 @@ def create_dialogue_audio(dialogue: List[Dict],
         save_individual=save_individual,
         process_audio=process_audio,
         normalize_text=normalize_text,
-        progress_callback=progress_callback
+        progress_callback=progress_callback,
+        precision=precision,
+        use_cache=use_cache,
+        skip_processing_if_clean=skip_processing_if_clean
     )
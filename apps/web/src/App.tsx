@@ -1,5 +1,5 @@
 import { useState, useEffect, useRef } from 'react';
-import { apiClient, GenerateDialogueRequest, GenerateDialogueResponse } from './api/client';
+import { apiClient, ApiError, GenerateDialogueRequest, GenerateDialogueResponse } from './api/client';
 import DialogueEditor from './components/DialogueEditor';
 import SettingsPanel from './components/SettingsPanel';
 import StatusDisplay from './components/StatusDisplay';
@@ -7,7 +7,7 @@ import StatusDisplay from './components/StatusDisplay';
 interface ProgressData {
   current_line: number;
   total_lines: number;
-  status: 'idle' | 'generating_line' | 'merging' | 'completed' | 'error';
+  status: 'idle' | 'queued' | 'generating_line' | 'merging' | 'completed' | 'error';
   message: string;
 }
 
@@ -20,6 +20,7 @@ const DEFAULT_SETTINGS: Omit<GenerateDialogueRequest, 'dialogue_text'> = {
   cfg_weight: 0.5,
   save_individual: true,
   process_audio: true,
+  use_cache: true,
   device: 'cpu',
 };
 
@@ -31,29 +32,73 @@ function App() {
   const [result, setResult] = useState<GenerateDialogueResponse | null>(null);
   const [error, setError] = useState<string | null>(null);
   const [progress, setProgress] = useState<ProgressData | null>(null);
+  const [jobId, setJobId] = useState<string | null>(null);
   const eventSourceRef = useRef<EventSource | null>(null);
 
-  // Setup progress streaming
+  // Follow the job's progress and fetch its result once it finishes
   useEffect(() => {
-    if (isGenerating) {
-      // Start listening to progress updates
-      const eventSource = new EventSource('http://localhost:8000/api/progress-stream');
+    if (isGenerating && jobId) {
+      // Start listening to progress updates for this job. If the connection
+      // drops, EventSource reconnects on its own and picks up the latest state.
+      const eventSource = new EventSource(apiClient.getProgressStreamUrl(jobId));
       eventSourceRef.current = eventSource;
 
+      const stopFollowing = () => {
+        eventSource.close();
+        eventSourceRef.current = null;
+        setIsGenerating(false);
+      };
+
+      const finishJob = async () => {
+        try {
+          setResult(await apiClient.getResult(jobId));
+        } catch (err) {
+          setError(err instanceof Error ? err.message : 'An unknown error occurred');
+        } finally {
+          stopFollowing();
+        }
+      };
+
       eventSource.onmessage = (event) => {
         const data: ProgressData = JSON.parse(event.data);
         setProgress(data);
+
+        if (data.status === 'completed' || data.status === 'error') {
+          finishJob();
+        }
       };
 
-      eventSource.onerror = () => {
-        eventSource.close();
+      // On a dropped or refused stream, ask for the result: a finished job
+      // ends here, an unknown one (e.g. after a server restart) surfaces
+      // as an error, and a running one is left to the reconnect
+      eventSource.onerror = async () => {
+        let jobResult: GenerateDialogueResponse | null;
+        try {
+          jobResult = await apiClient.getResult(jobId);
+        } catch (err) {
+          if (err instanceof ApiError) {
+            setError(err.message);
+            stopFollowing();
+          } else if (eventSource.readyState === EventSource.CLOSED) {
+            // EventSource gave up and the server is unreachable
+            setError('Lost connection to the server');
+            stopFollowing();
+          }
+          // Otherwise keep waiting for EventSource to reconnect
+          return;
+        }
+
+        if (jobResult) {
+          setResult(jobResult);
+          stopFollowing();
+        }
       };
 
       return () => {
         eventSource.close();
       };
     }
-  }, [isGenerating]);
+  }, [isGenerating, jobId]);
 
   // Handle generation
   const handleGenerate = async () => {
@@ -62,27 +107,23 @@ function App() {
       return;
     }
 
+    setJobId(null);
     setIsGenerating(true);
     setError(null);
     setResult(null);
     setProgress(null);
 
     try {
-      const response = await apiClient.generateDialogue({
+      // Submitting returns right away; progress and result follow via the job ID
+      const job = await apiClient.generateDialogue({
         dialogue_text: dialogueText,
         ...settings,
       });
 
-      setResult(response);
+      setJobId(job.job_id);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'An unknown error occurred');
-    } finally {
       setIsGenerating(false);
-      // Close event source when done
-      if (eventSourceRef.current) {
-        eventSourceRef.current.close();
-        eventSourceRef.current = null;
-      }
     }
   };
 
@@ -18,10 +18,19 @@ export interface GenerateDialogueRequest {
   save_individual: boolean;
   process_audio: boolean;
   device: string;
+  precision?: 'fp32' | 'fp16' | 'bf16';
+  use_cache: boolean;
+  skip_processing_if_clean?: boolean;
+}
+
+export interface GenerateDialogueJob {
+  status: string;
+  job_id: string;
 }
 
 export interface GenerateDialogueResponse {
   status: string;
+  job_id: string;
   output_file: string;
   lines_dir: string | null;
   duration_seconds: number;
@@ -41,6 +50,17 @@ export interface HealthResponse {
   version: string;
 }
 
+// Error returned by the backend (as opposed to a network failure)
+export class ApiError extends Error {
+  status: number;
+
+  constructor(message: string, status: number) {
+    super(message);
+    this.name = 'ApiError';
+    this.status = status;
+  }
+}
+
 // API Client class
 class ApiClient {
   private baseUrl: string;
@@ -63,11 +83,11 @@ class ApiClient {
   }
 
   /**
-   * Generate a dialogue audio file
+   * Submit a dialogue generation job
    */
   async generateDialogue(
     request: GenerateDialogueRequest
-  ): Promise<GenerateDialogueResponse> {
+  ): Promise<GenerateDialogueJob> {
     const response = await fetch(`${this.baseUrl}/api/generate-dialogue`, {
       method: 'POST',
       headers: {
@@ -87,6 +107,39 @@ class ApiClient {
     return data;
   }
 
+  /**
+   * Fetch the result of a generation job (null while it is still running)
+   */
+  async getResult(jobId: string): Promise<GenerateDialogueResponse | null> {
+    const response = await fetch(
+      `${this.baseUrl}/api/result/${encodeURIComponent(jobId)}`
+    );
+
+    if (response.status === 202) {
+      return null;
+    }
+
+    const data = await response.json();
+
+    if (!response.ok) {
+      // Backend returns error in detail field
+      const errorData = data.detail || data;
+      throw new ApiError(
+        errorData.details || errorData.error || 'Generation failed',
+        response.status
+      );
+    }
+
+    return data;
+  }
+
+  /**
+   * Get the Server-Sent Events URL for a generation job's progress
+   */
+  getProgressStreamUrl(jobId: string): string {
+    return `${this.baseUrl}/api/progress-stream?job_id=${encodeURIComponent(jobId)}`;
+  }
+
   /**
    * Get download URL for a generated file
    */
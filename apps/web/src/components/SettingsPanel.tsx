@@ -175,6 +175,22 @@ function SettingsPanel({
           />
           <span className="text-sm">Save individual line files</span>
         </label>
+
+        <label className="flex items-center gap-3 cursor-pointer">
+          <input
+            type="checkbox"
+            checked={settings.use_cache}
+            onChange={(e) => updateSetting('use_cache', e.target.checked)}
+            disabled={disabled}
+            className="w-4 h-4 rounded border-dark-border bg-dark-bg text-blue-500 focus:ring-2 focus:ring-blue-500/50 disabled:opacity-50 disabled:cursor-not-allowed"
+          />
+          <span className="text-sm">
+            Reuse cached lines
+            <span className="block text-xs text-dark-muted">
+              Uncheck to generate a fresh take of every line
+            </span>
+          </span>
+        </label>
       </div>
 
       {/* Device Selection */}
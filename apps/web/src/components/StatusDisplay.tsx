@@ -4,7 +4,7 @@ import { apiClient } from '../api/client';
 interface ProgressData {
   current_line: number;
   total_lines: number;
-  status: 'idle' | 'generating_line' | 'merging' | 'completed' | 'error';
+  status: 'idle' | 'queued' | 'generating_line' | 'merging' | 'completed' | 'error';
   message: string;
 }
 
@@ -51,7 +51,7 @@ REM Install FastAPI dependencies if venv exists
 if exist ".venv" (
     echo [*] Installing backend API dependencies...
     call .venv\Scripts\activate
-    pip install fastapi==0.115.5 uvicorn[standard]==0.34.0 python-multipart==0.0.20
+    pip install fastapi==0.115.5 uvicorn[standard]==0.34.0 orjson==3.10.12 python-multipart==0.0.20
     if %ERRORLEVEL% NEQ 0 (
         echo [ERROR] Failed to install backend dependencies!
         pause
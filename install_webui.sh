@@ -50,7 +50,7 @@ fi
 if [ -d ".venv" ]; then
     echo "[*] Installing backend API dependencies..."
     source .venv/bin/activate
-    pip install fastapi==0.115.5 uvicorn[standard]==0.34.0 python-multipart==0.0.20
+    pip install fastapi==0.115.5 uvicorn[standard]==0.34.0 orjson==3.10.12 python-multipart==0.0.20
 
     if [ $? -ne 0 ]; then
         echo "[ERROR] Failed to install backend dependencies!"